@@ -0,0 +1,93 @@
+"""add phone_e164, user lookup indexes and created_at default
+
+Revision ID: 786899c72550
+Revises:
+Create Date: 2026-10-15 12:00:00.000000
+
+Brings a users table created by an earlier init_db up to the current model.
+Steps that are already in place (e.g. on a database created by the current
+init_db) are skipped, so this is safe to run on either.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '786899c72550'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Same pattern as models._E164, in PostgreSQL regex syntax
+E164_PATTERN = r'^\+[1-9][0-9]{7,14}$'
+# Invalid rows listed in the error, at most
+MAX_REPORTED = 20
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    bind = op.get_bind()
+    inspector = sa.inspect(bind)
+    columns = {column["name"] for column in inspector.get_columns("users")}
+    indexes = {index["name"] for index in inspector.get_indexes("users")}
+
+    if "phone_e164" not in columns:
+        # phone_to_int only accepts E.164, so refuse to derive keys for
+        # anything else rather than store a wrong one
+        invalid = bind.execute(
+            sa.text(
+                "SELECT id, phone_number FROM users "
+                "WHERE phone_number !~ :pattern ORDER BY id"
+            ),
+            {"pattern": E164_PATTERN},
+        ).all()
+        if invalid:
+            listed = ", ".join(
+                f"{row.id}: {row.phone_number!r}" for row in invalid[:MAX_REPORTED]
+            )
+            raise RuntimeError(
+                f"{len(invalid)} users have phone numbers not in E.164 format "
+                f"(id: phone_number, first {MAX_REPORTED}): {listed}. "
+                "Correct them and run the migration again."
+            )
+        op.add_column("users", sa.Column("phone_e164", sa.BigInteger(), nullable=True))
+        op.execute("UPDATE users SET phone_e164 = substr(phone_number, 2)::bigint")
+        op.alter_column("users", "phone_e164", nullable=False)
+
+    # Superseded by ix_users_phone_e164
+    if "ix_users_phone_number" in indexes:
+        op.drop_index("ix_users_phone_number", table_name="users")
+    if "ix_users_phone_e164" not in indexes:
+        op.create_index("ix_users_phone_e164", "users", ["phone_e164"])
+    if "ix_users_last_first" not in indexes:
+        op.create_index("ix_users_last_first", "users", ["last_name", "first_name"])
+    if "ix_users_lower_name_dob" not in indexes:
+        op.create_index(
+            "ix_users_lower_name_dob",
+            "users",
+            [sa.text("lower(first_name)"), sa.text("lower(last_name)"), "date_of_birth"],
+        )
+
+    # The model declares created_at NOT NULL; rows from before the column
+    # had a default may be missing it
+    op.execute(
+        "UPDATE users SET created_at = now() AT TIME ZONE 'utc' WHERE created_at IS NULL"
+    )
+    op.alter_column(
+        "users",
+        "created_at",
+        nullable=False,
+        server_default=sa.text("(now() AT TIME ZONE 'utc')"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column("users", "created_at", nullable=True, server_default=None)
+    op.drop_index("ix_users_lower_name_dob", table_name="users")
+    op.drop_index("ix_users_last_first", table_name="users")
+    op.drop_index("ix_users_phone_e164", table_name="users")
+    op.drop_column("users", "phone_e164")
@@ -1,17 +1,248 @@
+import asyncio
+import hashlib
 import json
 import os
+import random
+import sqlite3
 import sys
+import time
+from itertools import islice
 from pathlib import Path
-from openai import OpenAI
+import numpy as np
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI, BadRequestError
 from pinecone import Pinecone, ServerlessSpec
 from dotenv import load_dotenv
 
+# Add the src directory to the path so we can share the provider store
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from provider_store import save_providers
+
 load_dotenv(".env.local")
 
 # Preview mode flag - shows first provider only
 PREVIEW_MODE = "--preview" in sys.argv
 # uv run scripts/embed_providers.py --preview
 
+# Verbose flag - prints a line per provider instead of per batch
+VERBOSE = "--verbose" in sys.argv
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Descriptions sent per embeddings request. Each description is ~150 tokens,
+# well under the 8191-token per-input limit and the per-request token budget.
+EMBED_BATCH = 100
+# Embedding requests allowed in flight at once (tune to your OpenAI tier)
+OPENAI_CONCURRENCY = int(os.getenv("OPENAI_CONCURRENCY", "8"))
+# Embedding requests allowed per minute (tune to your OpenAI tier)
+OPENAI_RPM = int(os.getenv("OPENAI_RPM", "3500"))
+# Attempts per embedding request before giving up, and the backoff ceiling
+MAX_ATTEMPTS = 6
+MAX_BACKOFF = 60
+# Statuses retried besides 5xx, matching the OpenAI SDK's own retry policy
+RETRYABLE_STATUSES = {408, 409, 429}
+# Decimal places kept per embedding value on upsert. Values of unit-length
+# 1536-dim embeddings are ~0.03 in magnitude, so 5 decimals is roughly FP16
+# precision, while cutting each value's JSON text from ~20 to ~8 characters.
+EMBEDDING_DECIMALS = 5
+# Vectors per Pinecone upsert request, and upsert requests sent in parallel
+UPSERT_BATCH = 64
+UPSERT_CONCURRENCY = 3
+# Upsert batches buffered between the embedding and upload stages
+QUEUE_SIZE = 4
+# Providers embedded and uploaded per round, bounding how much is held in memory
+DOCUMENT_CHUNK_SIZE = 1000
+# Characters read from the provider file at a time while streaming it
+READ_SIZE = 64 * 1024
+# On-disk cache of embeddings keyed by description hash. Bump CACHE_VERSION
+# whenever generate_description changes so stale embeddings are not reused.
+EMBED_CACHE_PATH = os.getenv("EMBED_CACHE_PATH", ".embed_cache.sqlite")
+CACHE_VERSION = "v1"
+
+
+def chunks(iterable, size):
+    """Yield successive lists of at most `size` items from `iterable`."""
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class EmbeddingCache:
+    """Persistent description -> embedding cache backed by SQLite."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB)"
+        )
+
+    @staticmethod
+    def key(description):
+        digest = hashlib.blake2b(description.encode("utf-8"), digest_size=16).hexdigest()
+        return f"{CACHE_VERSION}:{EMBEDDING_MODEL}:{digest}"
+
+    def get_many(self, keys):
+        """Return {key: embedding} for the keys present in the cache."""
+        placeholders = ",".join("?" * len(keys))
+        rows = self.conn.execute(
+            f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+            keys,
+        )
+        return {key: np.frombuffer(vector, dtype=np.float32) for key, vector in rows}
+
+    def set_many(self, items):
+        """Store {key: float32 embedding array}, packed as raw bytes."""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+            [(key, embedding.tobytes()) for key, embedding in items.items()],
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+class RateLimiter:
+    """Async token bucket allowing `max_rate` acquisitions per `period` seconds."""
+
+    def __init__(self, max_rate, period=60.0):
+        self.max_rate = max_rate
+        self.period = period
+        self.tokens = float(max_rate)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.max_rate,
+                    self.tokens + (now - self.updated) * self.max_rate / self.period,
+                )
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.period / self.max_rate)
+
+
+def retry_delay(error, attempt):
+    """
+    Seconds to wait before retrying a failed request.
+    Honors the Retry-After header (capped at MAX_BACKOFF), else backs off
+    exponentially.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(MAX_BACKOFF, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+    return min(MAX_BACKOFF, 2**attempt) + random.uniform(0, 1)
+
+
+def is_retryable(error):
+    """Whether a failed request is transient: connection errors, timeouts,
+    conflicts, rate limits and server errors."""
+    if isinstance(error, APIConnectionError):
+        return True
+    return error.status_code in RETRYABLE_STATUSES or error.status_code >= 500
+
+
+async def create_embeddings(openai_client, limiter, inputs):
+    """Call the embeddings API, retrying transient failures."""
+    for attempt in range(MAX_ATTEMPTS):
+        await limiter.acquire()
+        try:
+            return await openai_client.embeddings.create(
+                model=EMBEDDING_MODEL, input=inputs
+            )
+        except (APIConnectionError, APIStatusError) as e:
+            if not is_retryable(e) or attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = retry_delay(e, attempt)
+            print(f"Embedding request failed ({e}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+def quantize(embeddings):
+    """
+    Round a (batch, dim) float32 embedding matrix to EMBEDDING_DECIMALS and
+    return it as lists for the Pinecone client. Rounding happens in float64 so
+    the values serialize as short decimals.
+    """
+    return np.round(embeddings.astype(np.float64), EMBEDDING_DECIMALS).tolist()
+
+
+def iter_providers(path):
+    """
+    Stream providers from a JSON array file one object at a time.
+    Only the current read buffer is held in memory, never the whole list.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r") as f:
+        # Skip leading whitespace, however many reads it spans
+        buffer = ""
+        while not buffer:
+            more = f.read(READ_SIZE)
+            if not more:
+                break
+            buffer = more.lstrip()
+        if not buffer.startswith("["):
+            raise ValueError(f"Expected a JSON array in {path}")
+        pos = 1
+        eof = False
+        while True:
+            # Skip separators between items
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+            try:
+                item, end = decoder.raw_decode(buffer, pos)
+                # An item ending exactly at the buffer edge may be truncated
+                if end == len(buffer) and not eof:
+                    raise json.JSONDecodeError("Item may be truncated", buffer, end)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(READ_SIZE)
+                eof = not more
+                buffer = buffer[pos:] + more
+                pos = 0
+                continue
+            yield item
+            pos = end
+
+
+async def embed_batch(openai_client, semaphore, limiter, descriptions):
+    """
+    Embed a list of descriptions with a single API call, returning a
+    (len(descriptions), dim) float32 array.
+    Falls back to one request per description if the batch is rejected.
+    """
+    async with semaphore:
+        try:
+            response = await create_embeddings(openai_client, limiter, descriptions)
+        except BadRequestError as e:
+            print(f"Batch embedding rejected ({e}), retrying one at a time")
+            return np.asarray(
+                [
+                    (await create_embeddings(openai_client, limiter, description))
+                    .data[0]
+                    .embedding
+                    for description in descriptions
+                ],
+                dtype=np.float32,
+            )
+    # Results come back in input order, but sort by index to be safe
+    return np.asarray(
+        [item.embedding for item in sorted(response.data, key=lambda d: d.index)],
+        dtype=np.float32,
+    )
+
+
 def generate_description(provider):
     """
     Generate comprehensive natural language description for embedding.
@@ -74,36 +305,131 @@ Specialty: {get_val('specialty')}.
 
 def prepare_metadata(provider):
     """
-    Extract filterable metadata fields.
-    Includes both filter fields and full data for return.
+    Extract the Pinecone metadata: the filter fields, plus the name and
+    contact fields the agent needs to show a provider when the local provider
+    store (see full_record) is missing or stale.
     """
+    address = provider.get("address", {})
     return {
         # Filter fields
         "id": provider["id"],
         "specialty": provider.get("specialty", ""),
-        "state": provider.get("address", {}).get("state", ""),
-        "city": provider.get("address", {}).get("city", ""),
-        "zip": provider.get("address", {}).get("zip", ""),
+        "state": address.get("state", ""),
+        "city": address.get("city", ""),
+        "zip": address.get("zip", ""),
         "accepting_new_patients": provider.get("accepting_new_patients", False),
         "years_experience": provider.get("years_experience", 0),
         "rating": float(provider.get("rating", 0)),
         "board_certified": provider.get("board_certified", False),
         "languages": provider.get("languages", []),
         "insurance_accepted": provider.get("insurance_accepted", []),
-        # Complete data for agent response
+        # Display fields
         "full_name": provider.get("full_name", ""),
-        "first_name": provider.get("first_name", ""),
-        "last_name": provider.get("last_name", ""),
         "phone": provider.get("phone", ""),
         "email": provider.get("email", ""),
-        "address_street": provider.get("address", {}).get("street", ""),
+        "address_street": address.get("street", ""),
         "license_number": provider.get("license_number", ""),
     }
 
 
-def main():
+def full_record(provider):
+    """
+    Build the complete provider record returned by the agent's search tool.
+    """
+    address = provider.get("address", {})
+    return {
+        "id": provider["id"],
+        "full_name": provider.get("full_name", ""),
+        "specialty": provider.get("specialty", ""),
+        "phone": provider.get("phone", ""),
+        "email": provider.get("email", ""),
+        "address": {
+            "street": address.get("street", ""),
+            "city": address.get("city", ""),
+            "state": address.get("state", ""),
+            "zip": address.get("zip", ""),
+        },
+        "years_experience": provider.get("years_experience", 0),
+        "rating": float(provider.get("rating", 0)),
+        "board_certified": provider.get("board_certified", False),
+        "accepting_new_patients": provider.get("accepting_new_patients", False),
+        "languages": provider.get("languages", []),
+        "insurance_accepted": provider.get("insurance_accepted", []),
+        "license_number": provider.get("license_number", ""),
+    }
+
+
+async def embed_vectors(openai_client, semaphore, limiter, cache, batch):
+    """
+    Embed a batch of providers and build their Pinecone vectors.
+    Providers whose description is already cached skip the API entirely.
+    """
+    descriptions = [generate_description(provider) for provider in batch]
+    keys = [cache.key(description) for description in descriptions]
+    embeddings = cache.get_many(keys)
+
+    misses = [i for i, key in enumerate(keys) if key not in embeddings]
+    if misses:
+        fresh = await embed_batch(
+            openai_client, semaphore, limiter, [descriptions[i] for i in misses]
+        )
+        new_items = {keys[i]: embedding for i, embedding in zip(misses, fresh)}
+        cache.set_many(new_items)
+        embeddings.update(new_items)
+
+    save_providers([full_record(provider) for provider in batch])
+    values = quantize(np.stack([embeddings[key] for key in keys]))
+    return [
+        {
+            "id": str(provider["id"]),
+            "values": provider_values,
+            "metadata": prepare_metadata(provider),
+        }
+        for provider, provider_values in zip(batch, values)
+    ]
+
+
+async def produce_vectors(openai_client, cache, providers, queue):
+    """
+    Embedding stage: embed provider batches concurrently and queue the
+    resulting vectors for upload as each batch completes.
+    """
+    semaphore = asyncio.Semaphore(OPENAI_CONCURRENCY)
+    limiter = RateLimiter(OPENAI_RPM)
+    processed = 0
+    for document_chunk in chunks(providers, DOCUMENT_CHUNK_SIZE):
+        tasks = [
+            asyncio.create_task(
+                embed_vectors(openai_client, semaphore, limiter, cache, batch)
+            )
+            for batch in chunks(document_chunk, EMBED_BATCH)
+        ]
+        for next_done in asyncio.as_completed(tasks):
+            vectors = await next_done
+            processed += len(vectors)
+            if VERBOSE:
+                for vector in vectors:
+                    print(f"Processed provider {vector['id']}")
+            print(f"Embedded {processed} providers")
+            for upsert_batch in chunks(vectors, UPSERT_BATCH):
+                await queue.put(upsert_batch)
+
+    # One sentinel per consumer to signal there is no more work
+    for _ in range(UPSERT_CONCURRENCY):
+        await queue.put(None)
+
+
+async def upsert_vectors(index, queue):
+    """Upload stage: upsert queued vector batches until a sentinel arrives."""
+    while (vectors := await queue.get()) is not None:
+        await asyncio.to_thread(index.upsert, vectors=vectors)
+        print(f"✓ Uploaded batch of {len(vectors)} vectors")
+
+
+async def main_async():
     # Initialize clients
-    openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    # Retries are handled by create_embeddings so they respect the rate limiter
+    openai_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), max_retries=0)
     pc = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
     index_name = os.getenv("PINECONE_INDEX_NAME", "healthcare-providers")
 
@@ -114,15 +440,14 @@ def main():
         / "data"
         / "providerlist.json"
     )
-    with open(providers_path, "r") as f:
-        providers = json.load(f)
+    providers = iter_providers(providers_path)
 
     # PREVIEW MODE: Show first provider only
     if PREVIEW_MODE:
-
-        provider = providers[0]
-        description = generate_description(provider)
-        metadata = prepare_metadata(provider)
+        provider = next(providers)
+        print(f"Description:\n{generate_description(provider)}\n")
+        print(f"Metadata:\n{json.dumps(prepare_metadata(provider), indent=2)}\n")
+        print(f"Stored record:\n{json.dumps(full_record(provider), indent=2)}")
         return
 
     # Create index if doesn't exist
@@ -135,48 +460,29 @@ def main():
             spec=ServerlessSpec(cloud="aws", region="us-east-1"),
         )
 
-    index = pc.Index(index_name)
-
-    print(f"Embedding {len(providers)} providers...")
-
-    # Process and upload in batches
-    batch_size = 100
-    vectors = []
-
-    for i, provider in enumerate(providers, 1):
-        # Generate description
-        description = generate_description(provider)
+    print(f"Embedding providers from {providers_path}...")
 
-        # Create embedding
-        response = openai_client.embeddings.create(
-            model="text-embedding-3-small", input=description
-        )
-        embedding = response.data[0].embedding
-
-        # Prepare metadata
-        metadata = prepare_metadata(provider)
-
-        # Add to batch
-        vectors.append(
-            {
-                "id": str(provider["id"]),
-                "values": embedding,
-                "metadata": metadata,
-            }
-        )
+    # Overlap OpenAI and Pinecone round-trips: embedding batches feed a bounded
+    # queue drained by parallel upsert workers
+    queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    cache = EmbeddingCache(EMBED_CACHE_PATH)
+    with pc.Index(index_name) as index:
+        try:
+            await asyncio.gather(
+                produce_vectors(openai_client, cache, providers, queue),
+                *[upsert_vectors(index, queue) for _ in range(UPSERT_CONCURRENCY)],
+            )
+        finally:
+            cache.close()
 
-        print(f"Processed {i}/{len(providers)}: Dr. {provider.get('full_name', 'Unknown')}")
+        # Get index stats
+        stats = index.describe_index_stats()
+        print(f"\n✓ Successfully embedded {stats.total_vector_count} providers to Pinecone!")
+    print(f"Index: {index_name}")
 
-        # Upload batch
-        if len(vectors) >= batch_size or i == len(providers):
-            index.upsert(vectors=vectors)
-            print(f"✓ Uploaded batch of {len(vectors)} vectors")
-            vectors = []
 
-    # Get index stats
-    stats = index.describe_index_stats()
-    print(f"\n✓ Successfully embedded {stats.total_vector_count} providers to Pinecone!")
-    print(f"Index: {index_name}")
+def main():
+    asyncio.run(main_async())
 
 
 if __name__ == "__main__":
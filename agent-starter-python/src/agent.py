@@ -1,8 +1,12 @@
+import asyncio
 import logging
 import os
 import json
-from datetime import datetime
+import re
+from datetime import date, datetime
+from functools import lru_cache
 from typing import Optional
+import httpx
 import pytz
 
 from dotenv import load_dotenv
@@ -23,29 +27,225 @@ from livekit.agents import (
 )
 from livekit.plugins import noise_cancellation, silero, simli
 from livekit.plugins.turn_detector.multilingual import MultilingualModel
-from openai import OpenAI
-from pinecone import Pinecone
-from sqlalchemy import select
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from pinecone import Pinecone, PineconeAsyncio
+from sqlalchemy import bindparam, func, select
 
 # Import database and helper modules
 from database import async_session_factory, init_db
 from models import User
 from email_helper import EmailSender
-from sms_helper import SMSSender
+from sms_helper import SMSSender, close_async_client
+from cache_helper import LRUCache
+from provider_store import load_providers, store_exists, store_path
+
+# Use uvloop for the worker and job event loops; it is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    pass
+else:
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 logger = logging.getLogger("agent")
 
 load_dotenv(".env.local")
 
-# Initialize Pinecone and OpenAI clients
-pinecone_client = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+# Pinecone and OpenAI clients are created per process in prewarm()
 pinecone_index_name = os.getenv("PINECONE_INDEX_NAME", "voxagent")
-pinecone_index = pinecone_client.Index(pinecone_index_name)
-openai_client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
-# Initialize email and SMS senders
-email_sender = EmailSender()
-sms_sender = SMSSender()
+# Query embeddings cached per normalized query string
+query_embedding_cache = LRUCache(maxsize=512)
+
+# Successful verify_user results, keyed by (first name, last name, DOB), so
+# repeat verifications within a conversation skip the database
+verified_user_cache = LRUCache(maxsize=1024, ttl=600)
+
+# verify_user's lookup, built once with bound parameters so every call reuses
+# SQLAlchemy's compiled form (case-insensitive, served by ix_users_lower_name_dob)
+_VERIFY_USER_QUERY = select(
+    User.id,
+    User.first_name,
+    User.last_name,
+    User.email,
+    User.phone_number,
+).where(
+    func.lower(User.first_name) == bindparam("first_name"),
+    func.lower(User.last_name) == bindparam("last_name"),
+    User.date_of_birth == bindparam("date_of_birth")
+)
+
+
+async def _embed_query(openai_client: AsyncOpenAI, query: str) -> list[float]:
+    """Embed a normalized search query, caching repeats within the process."""
+    embedding = query_embedding_cache.get(query)
+    if embedding is None:
+        response = await openai_client.embeddings.create(
+            model="text-embedding-3-small",
+            input=query
+        )
+        embedding = response.data[0].embedding
+        query_embedding_cache.set(query, embedding)
+    return embedding
+
+
+# Compact JSON encoder for data-channel payloads, built once
+_PAYLOAD_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+# Strong references to fire-and-forget tasks so they aren't garbage collected
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_publish_done(task: asyncio.Task) -> None:
+    """Log the outcome of a background provider publish and release the task."""
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Failed to publish provider data: %s", task.exception())
+
+
+async def _warm_connections(userdata: dict) -> None:
+    """Open the OpenAI and Pinecone connection pools ahead of the first search.
+
+    Both requests are cheap reads; the point is to pay for DNS and the TLS
+    handshakes while the session is starting rather than on a user's turn.
+    """
+    results = await asyncio.gather(
+        userdata["openai"].models.retrieve("text-embedding-3-small"),
+        userdata["pinecone_index"].describe_index_stats(),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.warning("Connection warmup failed: %s", result)
+
+
+def _metadata_filter(conditions: dict) -> Optional[dict]:
+    """Build a Pinecone metadata filter from per-field conditions.
+
+    A single condition is passed as-is; several are combined with $and as one
+    predicate per field.
+    """
+    if len(conditions) > 1:
+        return {"$and": [{field: condition} for field, condition in conditions.items()]}
+    return conditions or None
+
+
+# Unambiguous role words and specialty names mapped to the exact specialty
+# names stored in Pinecone, so search_providers can fill in the specialty
+# filter when the LLM leaves it out. Body parts and conditions ("heart",
+# "kids", "cancer") are deliberately absent: they show up in queries that
+# aren't asking for that specialty. So is a bare "surgeon", since "eye
+# surgeon" or "spine surgeon" isn't asking for General Surgery.
+SPECIALTY_ALIASES = {
+    "anesthesiologist": "Anesthesiology",
+    "anesthesiology": "Anesthesiology",
+    "cardiologist": "Cardiology",
+    "cardiology": "Cardiology",
+    "dermatologist": "Dermatology",
+    "dermatology": "Dermatology",
+    "emergency medicine": "Emergency Medicine",
+    "emergency physician": "Emergency Medicine",
+    "endocrinologist": "Endocrinology",
+    "endocrinology": "Endocrinology",
+    "family doctor": "Family Medicine",
+    "family physician": "Family Medicine",
+    "family medicine": "Family Medicine",
+    "gastroenterologist": "Gastroenterology",
+    "gastroenterology": "Gastroenterology",
+    "general surgeon": "General Surgery",
+    "general surgery": "General Surgery",
+    "internist": "Internal Medicine",
+    "internal medicine": "Internal Medicine",
+    "neurologist": "Neurology",
+    "neurology": "Neurology",
+    "gynecologist": "Obstetrics and Gynecology",
+    "gynecology": "Obstetrics and Gynecology",
+    "obstetrician": "Obstetrics and Gynecology",
+    "obstetrics": "Obstetrics and Gynecology",
+    "obgyn": "Obstetrics and Gynecology",
+    "ob-gyn": "Obstetrics and Gynecology",
+    "oncologist": "Oncology",
+    "oncology": "Oncology",
+    "ophthalmologist": "Ophthalmology",
+    "ophthalmology": "Ophthalmology",
+    "orthopedist": "Orthopedic Surgery",
+    "orthopedic surgeon": "Orthopedic Surgery",
+    "orthopedic surgery": "Orthopedic Surgery",
+    "orthopedics": "Orthopedic Surgery",
+    "pathologist": "Pathology",
+    "pathology": "Pathology",
+    "pediatrician": "Pediatrics",
+    "pediatrics": "Pediatrics",
+    "physiatrist": "Physical Medicine",
+    "physical medicine": "Physical Medicine",
+    "psychiatrist": "Psychiatry",
+    "psychiatry": "Psychiatry",
+    "radiologist": "Radiology",
+    "radiology": "Radiology",
+    "urologist": "Urology",
+    "urology": "Urology",
+}
+# Whole-word match of any alias; longer aliases first so a multi-word alias
+# wins over any alias inside it
+_SPECIALTY_ALIAS_RE = re.compile(
+    r"\b(?:"
+    + "|".join(re.escape(alias) for alias in sorted(SPECIALTY_ALIASES, key=len, reverse=True))
+    + r")\b"
+)
+# Queries that rule a specialty out rather than ask for it
+_NEGATION_RE = re.compile(r"\b(?:not|no|don['\u2019]?t|other than|except)\b")
+
+
+def _specialty_from_query(query: str) -> Optional[str]:
+    """Return the specialty named in the query, if exactly one is.
+
+    Queries naming several specialties ("a cardiologist or a dermatologist")
+    or containing a negation ("I don't want a cardiologist") are left to the
+    LLM and semantic search.
+    """
+    query = query.lower()
+    if _NEGATION_RE.search(query):
+        return None
+    specialties = {
+        SPECIALTY_ALIASES[match.group(0)]
+        for match in _SPECIALTY_ALIAS_RE.finditer(query)
+    }
+    if len(specialties) == 1:
+        return specialties.pop()
+    return None
+
+
+# Fixed-format date/time parsing without going through datetime.strptime
+_DATE_RE = re.compile(r"^(\d{1,2})/(\d{1,2})/(\d{4})$")
+_TIME_RE = re.compile(r"^(\d{1,2}):(\d{1,2})\s*([AaPp])[Mm]$")
+
+
+def _parse_date(value: str) -> date:
+    """Parse an MM/DD/YYYY date, raising ValueError if it is malformed."""
+    match = _DATE_RE.match(value.strip())
+    if match is None:
+        raise ValueError(f"Invalid date '{value}', expected MM/DD/YYYY")
+    month, day, year = match.groups()
+    return date(int(year), int(month), int(day))
+
+
+def _parse_appointment_datetime(date_str: str, time_str: str) -> datetime:
+    """Parse an MM/DD/YYYY date and HH:MM AM/PM time into a naive datetime."""
+    appointment_date = _parse_date(date_str)
+    match = _TIME_RE.match(time_str.strip())
+    if match is None:
+        raise ValueError(f"Invalid time '{time_str}', expected HH:MM AM/PM")
+    hour, minute, meridiem = int(match.group(1)), int(match.group(2)), match.group(3)
+    if not 1 <= hour <= 12:
+        raise ValueError(f"Invalid time '{time_str}', expected HH:MM AM/PM")
+    hour = hour % 12 + (12 if meridiem in "Pp" else 0)
+    return datetime(appointment_date.year, appointment_date.month, appointment_date.day, hour, minute)
+
+
+@lru_cache(maxsize=512)
+def _tz(name: str):
+    """Resolve a pytz timezone by name, caching the result per name."""
+    return pytz.timezone(name)
 
 
 class Assistant(Agent):
@@ -98,10 +298,10 @@ Keep responses concise, professional, and conversational without special formatt
             timezone: The pytz timezone identifier (e.g., "Asia/Kolkata", "America/New_York", "Europe/London").
                      This parameter is REQUIRED - do not call this tool without a valid timezone.
         """
-        logger.info(f"Getting current time for timezone: {timezone}")
+        logger.info("Getting current time for timezone: %s", timezone)
         
         try:
-            tz = pytz.timezone(timezone)
+            tz = _tz(timezone)
             current_time = datetime.now(tz)
             
             # Format the response with detailed information
@@ -118,7 +318,7 @@ Keep responses concise, professional, and conversational without special formatt
             }
         
         except pytz.exceptions.UnknownTimeZoneError:
-            logger.warning(f"Unknown timezone: {timezone}")
+            logger.warning("Unknown timezone: %s", timezone)
             return {
                 "error": f"Unknown timezone '{timezone}'. Please provide a valid pytz timezone identifier.",
                 "full_response": f"I couldn't recognize the timezone '{timezone}'. Could you please tell me which city or region you're in?"
@@ -136,36 +336,42 @@ Keep responses concise, professional, and conversational without special formatt
             last_name: User's last name (confirmed and spelled out)  
             date_of_birth: User's date of birth in MM/DD/YYYY format (e.g., "04/03/2001")
         """
-        logger.info(f"Verifying user: {first_name} {last_name}, DOB: {date_of_birth}")
+        logger.info("Verifying user: %s %s, DOB: %s", first_name, last_name, date_of_birth)
         
         try:
             # Parse date of birth
-            dob = datetime.strptime(date_of_birth, "%m/%d/%Y").date()
+            dob = _parse_date(date_of_birth)
+            
+            cache_key = (first_name.lower(), last_name.lower(), dob.isoformat())
+            cached = verified_user_cache.get(cache_key)
+            if cached is not None:
+                logger.info("User verified (cached): %s", cached['user_id'])
+                return cached
             
             async with async_session_factory() as session:
                 # Query for user (case-insensitive)
                 result = await session.execute(
-                    select(User).where(
-                        User.first_name.ilike(first_name),
-                        User.last_name.ilike(last_name),
-                        User.date_of_birth == dob
-                    )
+                    _VERIFY_USER_QUERY,
+                    {"first_name": cache_key[0], "last_name": cache_key[1], "date_of_birth": dob}
                 )
-                user = result.scalar_one_or_none()
+                row = result.one_or_none()
                 
-                if user:
-                    logger.info(f"User verified: {user.id}")
-                    return {
+                if row:
+                    user_id, user_first_name, user_last_name, email, phone_number = row
+                    logger.info("User verified: %s", user_id)
+                    verified = {
                         "found": True,
-                        "user_id": user.id,
-                        "first_name": user.first_name,
-                        "last_name": user.last_name,
-                        "email": user.email,
-                        "phone_number": user.phone_number,
-                        "message": f"User {user.first_name} {user.last_name} verified successfully."
+                        "user_id": user_id,
+                        "first_name": user_first_name,
+                        "last_name": user_last_name,
+                        "email": email,
+                        "phone_number": phone_number,
+                        "message": f"User {user_first_name} {user_last_name} verified successfully."
                     }
+                    verified_user_cache.set(cache_key, verified)
+                    return verified
                 else:
-                    logger.info(f"User not found: {first_name} {last_name}")
+                    logger.info("User not found: %s %s", first_name, last_name)
                     return {
                         "found": False,
                         "message": "User not found in the system. Registration is required to proceed with appointments."
@@ -178,7 +384,7 @@ Keep responses concise, professional, and conversational without special formatt
                 "message": "Invalid date format. Expected MM/DD/YYYY format."
             }
         except Exception as e:
-            logger.error(f"Error verifying user: {e}")
+            logger.error("Error verifying user: %s", e)
             return {
                 "found": False,
                 "error": str(e),
@@ -204,43 +410,46 @@ Keep responses concise, professional, and conversational without special formatt
             appointment_time: Time in HH:MM AM/PM format (e.g., "10:00 AM")
             timezone: Timezone for the appointment (e.g., "America/New_York", "Asia/Kolkata")
         """
-        logger.info(f"Booking appointment for {user_first_name} with {provider_name} on {appointment_date} at {appointment_time}")
+        logger.info("Booking appointment for %s with %s on %s at %s", user_first_name, provider_name, appointment_date, appointment_time)
         
         try:
             # Parse datetime
-            datetime_str = f"{appointment_date} {appointment_time}"
-            appointment_dt = datetime.strptime(datetime_str, "%m/%d/%Y %I:%M %p")
+            appointment_dt = _parse_appointment_datetime(appointment_date, appointment_time)
             
             # Make timezone aware
-            tz = pytz.timezone(timezone)
+            tz = _tz(timezone)
             appointment_dt = tz.localize(appointment_dt)
             
             # Format appointment time for messages
             formatted_time = appointment_dt.strftime("%A, %B %d, %Y at %I:%M %p %Z")
             
-            # Send email confirmation
-            email_sent = False
-            try:
-                email_sent = email_sender.send_appointment_confirmation(
+            # Send email and SMS confirmations concurrently; the Gmail client
+            # is blocking, so it runs in a worker thread
+            userdata = get_job_context().proc.userdata
+            email_sent, sms_sent = await asyncio.gather(
+                asyncio.to_thread(
+                    userdata["email_sender"].send_appointment_confirmation,
                     to_email=user_email,
                     first_name=user_first_name,
                     provider_name=provider_name,
                     appointment_time=formatted_time
-                )
-            except Exception as e:
-                logger.error(f"Email send failed: {e}")
-            
-            # Send SMS confirmation
-            sms_sent = False
-            try:
-                sms_sent = sms_sender.send_appointment_confirmation(
+                ),
+                userdata["sms_sender"].send_appointment_confirmation_async(
                     to_phone=user_phone,
                     first_name=user_first_name,
                     provider_name=provider_name,
                     appointment_time=formatted_time
-                )
-            except Exception as e:
-                logger.error(f"SMS send failed: {e}")
+                ),
+                return_exceptions=True
+            )
+            if isinstance(email_sent, Exception):
+                logger.error("Email send failed: %s", email_sent)
+                email_sent = False
+            if isinstance(sms_sent, Exception):
+                logger.error("SMS send failed: %s", sms_sent)
+                sms_sent = False
+            else:
+                sms_sent = sms_sent.success
             
             confirmation_msg = f"Your appointment with {provider_name} is confirmed for {formatted_time}."
             if email_sent and sms_sent:
@@ -258,7 +467,7 @@ Keep responses concise, professional, and conversational without special formatt
             }
         
         except Exception as e:
-            logger.error(f"Error booking appointment: {e}")
+            logger.error("Error booking appointment: %s", e)
             return {
                 "success": False,
                 "error": str(e),
@@ -266,7 +475,7 @@ Keep responses concise, professional, and conversational without special formatt
             }
 
     @function_tool
-    async def search_providers(self, context: RunContext, query: str, specialty: Optional[str] = None, city: Optional[str] = None, state: Optional[str] = None, zip_code: Optional[str] = None, accepting_new_patients: Optional[bool] = None, min_years_experience: Optional[int] = None, min_rating: Optional[float] = None, board_certified: Optional[bool] = None, languages: Optional[list[str]] = None, insurance_accepted: Optional[list[str]] = None, limit: int = 5):
+    async def search_providers(self, context: RunContext, query: str, specialty: Optional[str] = None, city: Optional[str] = None, state: Optional[str] = None, zip_code: Optional[str] = None, accepting_new_patients: Optional[bool] = None, min_years_experience: Optional[int] = None, min_rating: Optional[float] = None, board_certified: Optional[bool] = None, languages: Optional[list[str]] = None, insurance_accepted: Optional[list[str]] = None, alternative_specialties: Optional[list[str]] = None, alternative_cities: Optional[list[str]] = None, limit: int = 5):
         """Search for healthcare providers matching specified criteria.
         
         Use this tool when the user asks for provider recommendations or wants to find doctors/specialists.
@@ -284,6 +493,10 @@ Keep responses concise, professional, and conversational without special formatt
         - "4 star rating" or "rated 4+" → min_rating=4.0
         - "highly rated" → min_rating=4.0
         
+        Alternatives:
+        - "a cardiologist or an endocrinologist" → specialty="Cardiology", alternative_specialties=["Endocrinology"]
+        - "in Milwaukee or Madison" → city="Milwaukee", alternative_cities=["Madison"]
+        
         Limit:
         - If user specifies a number (e.g., "3 providers", "give me 4 doctors") → use that exact number
         - If not specified → default to 5
@@ -300,19 +513,22 @@ Keep responses concise, professional, and conversational without special formatt
             board_certified: True if must be board certified
             languages: List of languages spoken (e.g., ["Italian", "Spanish"])
             insurance_accepted: List of insurance plans accepted (e.g., ["Blue Cross", "Aetna"])
+            alternative_specialties: Other specialties the user would also accept
+            alternative_cities: Other cities the user would also accept
             limit: Number of results to return (default: 5)
         """
-        logger.info(f"Searching providers: specialty={specialty}, city={city}, state={state}")
+        logger.info("Searching providers: specialty=%s, city=%s, state=%s", specialty, city, state)
+        
+        if specialty is None and not alternative_specialties:
+            specialty = _specialty_from_query(query)
+            if specialty:
+                logger.info("Mapped query to specialty: %s", specialty)
         
         try:
             # Build Pinecone metadata filter
             filter_conditions = {}
             
-            # Exact match filters
-            if specialty:
-                filter_conditions["specialty"] = {"$eq": specialty}
-            if city:
-                filter_conditions["city"] = {"$eq": city}
+            # Exact match filters (specialty and city are added per query below)
             if state:
                 filter_conditions["state"] = {"$eq": state}
             if zip_code:
@@ -334,48 +550,80 @@ Keep responses concise, professional, and conversational without special formatt
             if insurance_accepted:
                 filter_conditions["insurance_accepted"] = {"$in": insurance_accepted}
             
-            # Combine all filters with AND logic
-            metadata_filter = {"$and": [filter_conditions]} if filter_conditions else None
+            # Generate embedding for semantic search (cached per normalized query)
+            normalized_query = " ".join(query.lower().split())
+            job_ctx = get_job_context()
+            userdata = job_ctx.proc.userdata
+            query_embedding = await _embed_query(userdata["openai"], normalized_query)
             
-            # Generate embedding for semantic search
-            embedding_response = openai_client.embeddings.create(
-                model="text-embedding-3-small",
-                input=query
-            )
-            query_embedding = embedding_response.data[0].embedding
+            # Query Pinecone with filters and semantic search, once per
+            # combination of specialty and city; alternatives run concurrently
+            specialties = [s for s in dict.fromkeys([specialty, *(alternative_specialties or [])]) if s] or [None]
+            cities = [c for c in dict.fromkeys([city, *(alternative_cities or [])]) if c] or [None]
+            queries = []
+            for query_specialty in specialties:
+                for query_city in cities:
+                    conditions = dict(filter_conditions)
+                    if query_specialty:
+                        conditions["specialty"] = {"$eq": query_specialty}
+                    if query_city:
+                        conditions["city"] = {"$eq": query_city}
+                    queries.append(userdata["pinecone_index"].query(
+                        vector=query_embedding,
+                        top_k=limit,
+                        include_metadata=True,
+                        filter=_metadata_filter(conditions)
+                    ))
+            search_results = await asyncio.gather(*queries)
             
-            # Query Pinecone with filters and semantic search
-            search_results = pinecone_index.query(
-                vector=query_embedding,
-                top_k=limit,
-                include_metadata=True,
-                filter=metadata_filter
-            )
+            # Merge the result sets, keeping each provider's best score
+            best_matches = {}
+            for result in search_results:
+                for match in result.matches:
+                    if match.id not in best_matches or match.score > best_matches[match.id].score:
+                        best_matches[match.id] = match
+            matches = sorted(best_matches.values(), key=lambda m: m.score, reverse=True)[:limit]
             
-            # Extract provider data from results
+            # Look up full provider records for the matches in one batch;
+            # Pinecone metadata only carries the filter and contact fields
+            has_store = userdata["provider_store"]
+            records = {}
+            if has_store:
+                records = await asyncio.to_thread(
+                    load_providers, [match.id for match in matches]
+                )
             providers = []
-            for match in search_results.matches:
-                metadata = match.metadata
-                provider = {
-                    "id": metadata.get("id"),
-                    "full_name": metadata.get("full_name"),
-                    "specialty": metadata.get("specialty"),
-                    "phone": metadata.get("phone"),
-                    "email": metadata.get("email"),
-                    "address": {
-                        "street": metadata.get("address_street"),
-                        "city": metadata.get("city"),
-                        "state": metadata.get("state"),
-                        "zip": metadata.get("zip"),
-                    },
-                    "years_experience": metadata.get("years_experience"),
-                    "rating": metadata.get("rating"),
-                    "board_certified": metadata.get("board_certified"),
-                    "accepting_new_patients": metadata.get("accepting_new_patients"),
-                    "languages": metadata.get("languages", []),
-                    "insurance_accepted": metadata.get("insurance_accepted", []),
-                    "license_number": metadata.get("license_number"),
-                }
+            for match in matches:
+                provider = records.get(match.id)
+                if provider is None:
+                    if has_store:
+                        logger.warning("Provider %s missing from provider store", match.id)
+                    metadata = match.metadata
+                    if not metadata.get("full_name"):
+                        # Nothing to show the caller; skip rather than return
+                        # a record of blanks
+                        logger.warning("Provider %s has no name in Pinecone metadata; skipping", match.id)
+                        continue
+                    provider = {
+                        "id": metadata.get("id"),
+                        "full_name": metadata.get("full_name"),
+                        "specialty": metadata.get("specialty"),
+                        "phone": metadata.get("phone"),
+                        "email": metadata.get("email"),
+                        "address": {
+                            "street": metadata.get("address_street"),
+                            "city": metadata.get("city"),
+                            "state": metadata.get("state"),
+                            "zip": metadata.get("zip"),
+                        },
+                        "years_experience": metadata.get("years_experience"),
+                        "rating": metadata.get("rating"),
+                        "board_certified": metadata.get("board_certified"),
+                        "accepting_new_patients": metadata.get("accepting_new_patients"),
+                        "languages": metadata.get("languages", []),
+                        "insurance_accepted": metadata.get("insurance_accepted", []),
+                        "license_number": metadata.get("license_number"),
+                    }
                 providers.append(provider)
             
             if not providers:
@@ -385,21 +633,25 @@ Keep responses concise, professional, and conversational without special formatt
                     "message": "No providers found matching your criteria. Would you like to search with different filters?"
                 }
             
-            logger.info(f"Found {len(providers)} providers")
+            logger.info("Found %s providers", len(providers))
             
             # Send providers to frontend via data channel
             try:
-                room = get_job_context().room
-                payload_data = {"providers": providers}
-                payload_json = json.dumps(payload_data)
-                payload_bytes = payload_json.encode("utf-8")
+                room = job_ctx.room
+                payload_bytes = _PAYLOAD_ENCODER.encode({"providers": providers}).encode("utf-8")
                 
-                await room.local_participant.publish_data(
-                    payload_bytes,
-                    topic="provider_results"
+                # Publish in the background so the tool result reaches the LLM
+                # without waiting on the data channel
+                publish_task = asyncio.create_task(
+                    room.local_participant.publish_data(
+                        payload_bytes,
+                        topic="provider_results"
+                    )
                 )
+                _background_tasks.add(publish_task)
+                publish_task.add_done_callback(_on_publish_done)
             except Exception as e:
-                logger.error(f"Failed to publish provider data: {e}", exc_info=True)
+                logger.error("Failed to publish provider data: %s", e, exc_info=True)
             
             return {
                 "providers": providers,
@@ -408,7 +660,7 @@ Keep responses concise, professional, and conversational without special formatt
             }
         
         except Exception as e:
-            logger.error(f"Error searching providers: {e}")
+            logger.error("Error searching providers: %s", e)
             return {
                 "providers": [],
                 "count": 0,
@@ -420,6 +672,46 @@ Keep responses concise, professional, and conversational without special formatt
 def prewarm(proc: JobProcess):
     proc.userdata["vad"] = silero.VAD.load()
 
+    # Full provider records come from the store written by
+    # scripts/embed_providers.py; without it searches fall back to Pinecone
+    # metadata, which has the name and contact fields but not every detail
+    proc.userdata["provider_store"] = store_exists()
+    if not proc.userdata["provider_store"]:
+        logger.error(
+            "Provider store %s not found; run scripts/embed_providers.py and deploy "
+            "its output with the agent. Provider details will come from Pinecone "
+            "metadata only.",
+            store_path(),
+        )
+
+    # Resolve the Pinecone index host once per process, before any job is
+    # assigned, instead of at import time in every worker
+    pinecone_client = Pinecone(api_key=os.getenv("PINECONE_API_KEY"))
+    proc.userdata["pinecone_host"] = pinecone_client.describe_index(pinecone_index_name).host
+    # Keep idle connections open well past httpx's 5s default: searches are
+    # usually further apart than that, and each reconnect costs a TLS handshake
+    http_client = DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_keepalive_connections=20, max_connections=50, keepalive_expiry=60
+        )
+    )
+    proc.userdata["openai"] = AsyncOpenAI(
+        api_key=os.getenv("OPENAI_API_KEY"), http_client=http_client
+    )
+
+    # Authenticate Gmail up front so the first booking doesn't pay for loading
+    # or refreshing the token and building the service. Only a saved token is
+    # used here: the OAuth flow needs a browser and a free port, neither of
+    # which an idle worker has.
+    email_sender = EmailSender()
+    if os.path.exists(email_sender.token_file):
+        try:
+            email_sender.authenticate(interactive=False)
+        except Exception as e:
+            logger.warning("Gmail prewarm failed, will authenticate on first send: %s", e)
+    proc.userdata["email_sender"] = email_sender
+    proc.userdata["sms_sender"] = SMSSender()
+
 
 async def entrypoint(ctx: JobContext):
     # Logging setup
@@ -432,6 +724,19 @@ async def entrypoint(ctx: JobContext):
     await init_db()
     logger.info("Database initialized")
 
+    # Async Pinecone client for provider search; its HTTP session is bound to
+    # this job's event loop, so it is created here rather than in prewarm
+    pinecone_async = PineconeAsyncio(api_key=os.getenv("PINECONE_API_KEY"))
+    pinecone_index = pinecone_async.IndexAsyncio(host=ctx.proc.userdata["pinecone_host"])
+    ctx.proc.userdata["pinecone_index"] = pinecone_index
+    ctx.add_shutdown_callback(pinecone_index.close)
+    ctx.add_shutdown_callback(pinecone_async.close)
+
+    # Warm both connection pools in the background while the session starts
+    warmup_task = asyncio.create_task(_warm_connections(ctx.proc.userdata))
+    _background_tasks.add(warmup_task)
+    warmup_task.add_done_callback(_background_tasks.discard)
+
     # Set up a voice AI pipeline using OpenAI, Cartesia, AssemblyAI, and the LiveKit turn detector
     session = AgentSession(
         # Speech-to-text (STT) is your agent's ears, turning the user's speech into text that the LLM can understand
@@ -475,9 +780,11 @@ async def entrypoint(ctx: JobContext):
 
     async def log_usage():
         summary = usage_collector.get_summary()
-        logger.info(f"Usage: {summary}")
+        logger.info("Usage: %s", summary)
 
     ctx.add_shutdown_callback(log_usage)
+    ctx.add_shutdown_callback(ctx.proc.userdata["openai"].close)
+    ctx.add_shutdown_callback(close_async_client)
 
     # Add virtual avatar using Simli
     avatar = simli.AvatarSession(
@@ -0,0 +1,41 @@
+import time
+from collections import OrderedDict
+from typing import Optional
+
+
+class LRUCache:
+    """Small in-process least-recently-used cache with optional expiry.
+
+    Used for values fetched by async code (where functools.lru_cache can't
+    wrap the coroutine). Not thread-safe; intended for use on one event loop.
+    """
+
+    def __init__(self, maxsize: int = 512, ttl: Optional[float] = None):
+        """
+        Args:
+            maxsize: Maximum number of entries kept
+            ttl: Seconds an entry stays valid, or None to keep it until evicted
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+
+    def get(self, key, default=None):
+        """Return the cached value for key, marking it most recently used."""
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        """Store value for key, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
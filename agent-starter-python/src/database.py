@@ -23,8 +23,15 @@ engine = create_async_engine(
     DATABASE_URL,
     echo=False,  # Set to True for SQL query logging during debugging
     pool_pre_ping=True,  # Verify connections before using them
-    pool_size=5,  # Number of connections to keep in the pool
-    max_overflow=10,  # Maximum overflow connections
+    pool_size=20,  # Number of connections to keep in the pool
+    max_overflow=20,  # Maximum overflow connections
+    pool_recycle=1800,  # Replace connections older than 30 minutes
+    query_cache_size=1200,  # Compiled SQL cache entries (default 500)
+    connect_args={
+        # Reuse prepared statements for repeated queries such as verify_user
+        "prepared_statement_cache_size": 256,  # SQLAlchemy asyncpg adapter cache
+        "statement_cache_size": 256,  # asyncpg's own statement cache
+    },
 )
 
 # Create async session factory
@@ -1,10 +1,13 @@
 import os
-import pickle
 import base64
 import logging
-from email.mime.text import MIMEText
+import tempfile
+from email.message import EmailMessage
+from email.policy import SMTP
+import httplib2
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 
@@ -13,29 +16,64 @@ logger = logging.getLogger("email")
 # Gmail API scopes
 SCOPES = ['https://www.googleapis.com/auth/gmail.send']
 
+# Timeout (seconds) for Gmail API requests
+HTTP_TIMEOUT = 10
+
+# Appointment confirmation email, formatted with first_name, provider_name
+# and appointment_time
+CONFIRMATION_SUBJECT = "Appointment Confirmation - Voxology Healthcare"
+CONFIRMATION_BODY = """
+        <html>
+        <body>
+            <h2>Appointment Confirmation</h2>
+            <p>Dear {first_name},</p>
+            
+            <p>Your appointment has been successfully booked!</p>
+            
+            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
+                <strong>Provider:</strong> {provider_name}<br>
+                <strong>Date & Time:</strong> {appointment_time}
+            </div>
+            
+            <p>If you need to reschedule or cancel, please contact our office.</p>
+            
+            <p>Best regards,<br>
+            Voxology Healthcare Team</p>
+        </body>
+        </html>
+        """
+
 
 class EmailSender:
     """Helper class for sending emails via Gmail API"""
     
     def __init__(self):
         self.credentials_file = os.getenv("GMAIL_CREDENTIALS_FILE", "credentials.json")
-        self.token_file = os.getenv("GMAIL_TOKEN_FILE", "token.pickle")
+        self.token_file = os.getenv("GMAIL_TOKEN_FILE", "token.json")
         self.sender_email = os.getenv("SENDER_EMAIL")
         self.service = None
     
-    def authenticate(self):
+    def authenticate(self, interactive: bool = True):
         """Authenticate with Gmail API using OAuth2.
         
         Loads existing credentials from token file if available.
         If not available or expired, initiates OAuth flow to get new credentials.
         Saves credentials to token file for future use.
+        
+        Args:
+            interactive: Allow the browser-based OAuth flow. When False (e.g.
+                in worker prewarm), only a saved token that is valid or
+                refreshable is used.
+        
+        Raises:
+            RuntimeError: If interactive is False and the saved token is
+                missing or can't be refreshed
         """
         creds = None
         
         # Load existing token if it exists
         if os.path.exists(self.token_file):
-            with open(self.token_file, 'rb') as token:
-                creds = pickle.load(token)
+            creds = Credentials.from_authorized_user_file(self.token_file, SCOPES)
         
         # If no valid credentials, get new ones
         if not creds or not creds.valid:
@@ -43,6 +81,11 @@ class EmailSender:
                 # Refresh expired credentials
                 creds.refresh(Request())
                 logger.info("Refreshed Gmail credentials")
+            elif not interactive:
+                raise RuntimeError(
+                    f"No valid or refreshable Gmail token in {self.token_file}; "
+                    "run the OAuth flow interactively to create one"
+                )
             else:
                 # Get new credentials via OAuth flow
                 flow = InstalledAppFlow.from_client_secrets_file(
@@ -52,13 +95,36 @@ class EmailSender:
                 logger.info("Obtained new Gmail credentials")
             
             # Save credentials for future use
-            with open(self.token_file, 'wb') as token:
-                pickle.dump(creds, token)
+            self._save_token(creds)
         
         # Build Gmail API service
-        self.service = build('gmail', 'v1', credentials=creds)
+        # Reuse one authorized keep-alive connection for every send, and use
+        # the discovery document bundled with the client library instead of
+        # fetching it over HTTP
+        http = AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+        self.service = build('gmail', 'v1', http=http,
+                             cache_discovery=False, static_discovery=True)
         logger.info("Gmail authentication successful")
     
+    def _save_token(self, creds):
+        """Write credentials to the token file atomically.
+
+        Every worker process refreshes and saves the token in prewarm, so the
+        file is written to a temporary file in the same directory and then
+        renamed over the token file. Readers never see a partially written
+        token.
+        """
+        directory = os.path.dirname(os.path.abspath(self.token_file))
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=".token-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as token:
+                token.write(creds.to_json())
+            os.replace(tmp_path, self.token_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
     def send_appointment_confirmation(self, to_email: str, first_name: str, 
                                      provider_name: str, appointment_time: str):
         """Send appointment confirmation email.
@@ -75,38 +141,22 @@ class EmailSender:
         if not self.service:
             self.authenticate()
         
-        subject = "Appointment Confirmation - Voxology Healthcare"
-        
         # Create email body with HTML formatting
-        body = f"""
-        <html>
-        <body>
-            <h2>Appointment Confirmation</h2>
-            <p>Dear {first_name},</p>
-            
-            <p>Your appointment has been successfully booked!</p>
-            
-            <div style="background-color: #f5f5f5; padding: 15px; border-radius: 5px; margin: 20px 0;">
-                <strong>Provider:</strong> {provider_name}<br>
-                <strong>Date & Time:</strong> {appointment_time}
-            </div>
-            
-            <p>If you need to reschedule or cancel, please contact our office.</p>
-            
-            <p>Best regards,<br>
-            Voxology Healthcare Team</p>
-        </body>
-        </html>
-        """
+        body = CONFIRMATION_BODY.format(
+            first_name=first_name,
+            provider_name=provider_name,
+            appointment_time=appointment_time,
+        )
         
-        # Create MIME message
-        message = MIMEText(body, 'html')
-        message['to'] = to_email
-        message['from'] = self.sender_email
-        message['subject'] = subject
+        # Create message (SMTP policy serializes with CRLF line endings)
+        message = EmailMessage(policy=SMTP)
+        message.set_content(body, subtype='html')
+        message['To'] = to_email
+        message['From'] = self.sender_email
+        message['Subject'] = CONFIRMATION_SUBJECT
         
         # Encode message
-        raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+        raw_message = base64.urlsafe_b64encode(bytes(message)).decode('ascii')
         
         try:
             # Send email via Gmail API
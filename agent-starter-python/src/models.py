@@ -1,6 +1,27 @@
-from datetime import datetime
-from sqlalchemy import Column, Integer, String, Date, DateTime
-from sqlalchemy.orm import DeclarativeBase
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import ClassVar
+from sqlalchemy import BigInteger, String, Index, func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, validates
+
+
+# E.164 phone number, the same pattern sms_helper checks before sending
+_E164 = re.compile(r"^\+[1-9]\d{7,14}$")
+
+
+def phone_to_int(phone_number: str) -> int:
+    """Convert an E.164 phone number to its integer key, e.g. +14155551234 -> 14155551234.
+    
+    Raises:
+        ValueError: If phone_number is not in E.164 format
+    """
+    if not isinstance(phone_number, str) or not _E164.match(phone_number):
+        raise ValueError(
+            f"phone_number must be in E.164 format (e.g. +14155551234), got {phone_number!r}"
+        )
+    return int(phone_number[1:])
 
 
 class Base(DeclarativeBase):
@@ -11,15 +32,100 @@ class Base(DeclarativeBase):
 class User(Base):
     """User model for storing patient information"""
     __tablename__ = "users"
+    # Fetch server-generated values via INSERT ... RETURNING, which lets
+    # multi-row inserts be batched
+    __mapper_args__: ClassVar[dict] = {"eager_defaults": "auto"}
+    # Index for lookups by exact patient name (phone lookups use phone_e164)
+    __table_args__ = (
+        Index("ix_users_last_first", "last_name", "first_name"),
+    )
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    first_name: Mapped[str] = mapped_column(String(100))
+    last_name: Mapped[str] = mapped_column(String(100))
+    date_of_birth: Mapped[date]
+    email: Mapped[str] = mapped_column(String(255), unique=True)
+    # Stored in E.164 format; validated by _normalize_phone and bulk_create
+    phone_number: Mapped[str] = mapped_column(String(20))
+    # Numeric form of phone_number for indexed lookups (8-byte keys instead
+    # of strings); E.164 allows at most 15 digits, so it always fits
+    phone_e164: Mapped[int] = mapped_column(BigInteger, index=True)
+    # Stamped by the database in UTC, so inserts don't carry a timestamp parameter
+    created_at: Mapped[datetime] = mapped_column(server_default=text("(now() AT TIME ZONE 'utc')"))
+    
+    @classmethod
+    async def bulk_create(cls, session: AsyncSession, rows: list[dict]) -> list["User"]:
+        """Insert many users in one batched INSERT ... RETURNING.
+        
+        Skips the per-object unit-of-work bookkeeping of session.add() in a
+        loop. The caller commits the session.
+        
+        Args:
+            session: Open async session
+            rows: One dict of column values per user
+        
+        Returns:
+            list[User]: The inserted users, in the order given
+        """
+        # Core inserts bypass @validates, so derive phone_e164 here
+        rows = [
+            {"phone_e164": phone_to_int(row["phone_number"]), **row}
+            for row in rows
+        ]
+        result = await session.scalars(insert(cls).returning(cls, sort_by_parameter_order=True), rows)
+        return result.all()
     
-    id = Column(Integer, primary_key=True, autoincrement=True)
-    first_name = Column(String(100), nullable=False)
-    last_name = Column(String(100), nullable=False)
-    date_of_birth = Column(Date, nullable=False)
-    email = Column(String(255), nullable=False, unique=True)
-    phone_number = Column(String(20), nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.utcnow())
+    @validates("phone_number")
+    def _normalize_phone(self, key, phone_number):
+        self.phone_e164 = phone_to_int(phone_number)
+        return phone_number
+    
+    @classmethod
+    async def fetch_light(cls, session: AsyncSession, **filters) -> list["UserRow"]:
+        """Fetch users matching column equality filters as plain UserRow tuples.
+        
+        For read-only lookups: selects the columns directly, skipping ORM
+        instances and the identity map.
+        
+        Args:
+            session: Open async session
+            **filters: Column values to match, e.g. phone_number="+1234567890"
+        
+        Returns:
+            list[UserRow]: Matching users
+        """
+        result = await session.execute(select(*_USER_ROW_COLUMNS).filter_by(**filters))
+        return [UserRow(*row) for row in result.tuples()]
     
     def __repr__(self):
         return f"<User(id={self.id}, name={self.first_name} {self.last_name})>"
 
+
+# Functional index for verify_user's case-insensitive name + DOB lookup
+Index(
+    "ix_users_lower_name_dob",
+    func.lower(User.first_name),
+    func.lower(User.last_name),
+    User.date_of_birth,
+)
+
+
+@dataclass(frozen=True)
+class UserRow:
+    """Read-only snapshot of a user row, returned by User.fetch_light"""
+    # Declared by hand since dataclass(slots=True) needs Python 3.10. Order
+    # matters: _USER_ROW_COLUMNS selects columns in this order for UserRow(*row)
+    __slots__ = ("id", "first_name", "last_name", "date_of_birth", "email", "phone_number", "phone_e164", "created_at")  # noqa: RUF023
+    
+    id: int
+    first_name: str
+    last_name: str
+    date_of_birth: date
+    email: str
+    phone_number: str
+    phone_e164: int
+    created_at: datetime
+
+
+# Columns selected by User.fetch_light, in UserRow field order
+_USER_ROW_COLUMNS = tuple(User.__table__.c[name] for name in UserRow.__slots__)
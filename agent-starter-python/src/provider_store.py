@@ -0,0 +1,77 @@
+import json
+import os
+import sqlite3
+from pathlib import Path
+
+# Full provider records live in a local SQLite file written by
+# scripts/embed_providers.py; Pinecone only stores the fields used for filtering.
+# The file must be deployed alongside the agent. It defaults to the project
+# root so the script and the agent agree regardless of working directory.
+DEFAULT_STORE_PATH = Path(__file__).resolve().parent.parent / "providers.sqlite"
+
+
+def store_path(path=None):
+    """Resolve the store file (argument, PROVIDER_STORE_PATH, or the default)."""
+    return Path(path or os.getenv("PROVIDER_STORE_PATH") or DEFAULT_STORE_PATH)
+
+
+def store_exists(path=None):
+    """Whether the provider store file is present."""
+    return store_path(path).is_file()
+
+
+def _connect(path=None, readonly=True):
+    if readonly:
+        # Never create the file on read; a missing store raises instead
+        uri = store_path(path).resolve().as_uri() + "?mode=ro"
+        return sqlite3.connect(uri, uri=True)
+    conn = sqlite3.connect(store_path(path))
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS providers (id TEXT PRIMARY KEY, record TEXT NOT NULL)"
+    )
+    return conn
+
+
+def save_providers(records, path=None):
+    """Insert or replace provider records, keyed by their string id.
+
+    Args:
+        records: Provider dicts as returned to the agent, each with an "id"
+        path: Store file (defaults to PROVIDER_STORE_PATH or providers.sqlite in the project root)
+    """
+    conn = _connect(path, readonly=False)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO providers (id, record) VALUES (?, ?)",
+                [(str(record["id"]), json.dumps(record)) for record in records],
+            )
+    finally:
+        conn.close()
+
+
+def load_providers(ids, path=None):
+    """Fetch provider records by id in a single query.
+
+    Args:
+        ids: Provider ids (the Pinecone vector ids)
+        path: Store file (defaults to PROVIDER_STORE_PATH or providers.sqlite in the project root)
+
+    Returns:
+        dict: Mapping of id to provider record for the ids found
+
+    Raises:
+        sqlite3.OperationalError: If the store file does not exist
+    """
+    ids = [str(provider_id) for provider_id in ids]
+    if not ids:
+        return {}
+    conn = _connect(path)
+    try:
+        placeholders = ",".join("?" * len(ids))
+        rows = conn.execute(
+            f"SELECT id, record FROM providers WHERE id IN ({placeholders})", ids
+        )
+        return {provider_id: json.loads(record) for provider_id, record in rows}
+    finally:
+        conn.close()
@@ -1,27 +1,235 @@
+import asyncio
 import os
+import re
+import json
 import logging
-from twilio.rest import Client
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import HTTPError, RequestException
+from twilio.base.exceptions import TwilioRestException
+
+if TYPE_CHECKING:
+    from twilio.rest import Client
 
 logger = logging.getLogger("sms")
 
+# Timeout (seconds) for Twilio API requests
+HTTP_TIMEOUT = 10
+
+# HTTP session shared by direct sends and the Twilio SDK client, so every send
+# reuses one pool of keep-alive connections to api.twilio.com
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=20, pool_maxsize=20))
+
+# Twilio client shared by every SMSSender in the process
+_client: Optional["Client"] = None
+_client_lock = threading.Lock()
+
+# Appointment confirmation SMS, formatted with first_name, provider_name and
+# appointment_time
+CONFIRMATION_BODY = (
+    "Hi {first_name}, your appointment with {provider_name} "
+    "is confirmed for {appointment_time}. - Voxology Healthcare"
+)
+
+# E.164 phone number: "+", country code, then up to 15 digits in total
+_E164 = re.compile(r"^\+[1-9]\d{7,14}$")
+
+# Worker threads for background sends, so callers don't wait on Twilio
+_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="sms")
+
+# Twilio Messages endpoint, used directly by the HTTP send paths
+MESSAGES_URL = "https://api.twilio.com/2010-04-01/Accounts/{account_sid}/Messages.json"
+
+# Async HTTP client for the async send path, created on first use in the
+# running event loop
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+@lru_cache(maxsize=1)
+def _twilio_config():
+    """Read Twilio credentials from the environment once per process.
+
+    Resolved lazily rather than at import time, since the agent loads
+    .env.local after importing this module.
+    """
+    return (
+        os.getenv('TWILIO_ACCOUNT_SID'),
+        os.getenv('TWILIO_AUTH_TOKEN'),
+        os.getenv('TWILIO_PHONE_NUMBER'),
+    )
+
+
+@lru_cache(maxsize=1)
+def _notify_service_sid() -> Optional[str]:
+    """Twilio Notify service used for bulk sends, if configured."""
+    return os.getenv('TWILIO_NOTIFY_SERVICE_SID')
+
+
+@lru_cache(maxsize=1)
+def _use_sdk() -> bool:
+    """Whether single sends, sync and async, go through the Twilio SDK
+    (TWILIO_USE_SDK=1) instead of posting to the Messages endpoint directly."""
+    return os.getenv('TWILIO_USE_SDK', '').lower() in ('1', 'true', 'yes')
+
+
+def _get_client() -> "Client":
+    """Return the process-wide Twilio client, creating it on first use.
+
+    The Twilio SDK is imported here rather than at module level, since its
+    import chain is large and only Notify bulk sends and TWILIO_USE_SDK need it.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                from twilio.http.http_client import TwilioHttpClient
+                from twilio.rest import Client
+                
+                account_sid, auth_token, _ = _twilio_config()
+                http_client = TwilioHttpClient(pool_connections=False, timeout=HTTP_TIMEOUT)
+                http_client.session = _SESSION
+                _client = Client(account_sid, auth_token, http_client=http_client)
+    return _client
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """Return the process-wide async HTTP client, creating it on first use."""
+    global _async_client
+    if _async_client is None:
+        _async_client = httpx.AsyncClient(
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=20, keepalive_expiry=60),
+        )
+    return _async_client
+
+
+async def close_async_client():
+    """Close the async HTTP client; a later async send creates a new one."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+
+
+def _confirmation_body(first_name: str, provider_name: str, appointment_time: str) -> str:
+    """Build the appointment confirmation text (SMS has character limits)."""
+    return CONFIRMATION_BODY.format(
+        first_name=first_name,
+        provider_name=provider_name,
+        appointment_time=appointment_time,
+    )
+
+
+def _is_retryable(status: int) -> bool:
+    """Whether a Twilio HTTP status is worth retrying (rate limits, server errors)."""
+    return status == 429 or status >= 500
+
+
+@dataclass(frozen=True)
+class SendResult:
+    """Outcome of an SMS send; truthy when Twilio accepted the message"""
+    success: bool
+    sid: Optional[str] = None
+    error: Optional[str] = None
+    
+    def __bool__(self):
+        return self.success
+
+
+def _prepare_message(to_phone: str, first_name: str, provider_name: str,
+                     appointment_time: str) -> Optional[str]:
+    """Validate the recipient and build the message text.
+    
+    Returns None (after logging) for numbers that aren't E.164, rejecting them
+    locally rather than after a Twilio round trip.
+    """
+    if not _E164.match(to_phone):
+        logger.warning("Invalid phone number, SMS not sent: %s", to_phone)
+        return None
+    return _confirmation_body(first_name, provider_name, appointment_time)
+
+
+def _send_failed(to_phone: str, error: Exception) -> SendResult:
+    """Turn a failed send into a SendResult, re-raising transient errors.
+    
+    Rejections (4xx other than 429) become a falsy SendResult. Network
+    errors, timeouts, rate limiting and Twilio server errors are re-raised so
+    the caller can retry.
+    """
+    if isinstance(error, TwilioRestException):
+        status, detail = error.status, error.msg
+    elif isinstance(error, (HTTPError, httpx.HTTPStatusError)):
+        status, detail = error.response.status_code, error.response.text
+    else:
+        status, detail = None, str(error)
+    
+    if status is None or _is_retryable(status):
+        logger.warning("Transient error sending SMS to %s: %s", to_phone, error)
+        raise error
+    logger.error("Failed to send SMS to %s: %s", to_phone, error)
+    return SendResult(False, error=detail)
+
+
+def _post_message(from_number: str, to_phone: str, body: str) -> str:
+    """POST one message to the Twilio Messages endpoint; returns its SID."""
+    account_sid, auth_token, _ = _twilio_config()
+    response = _SESSION.post(
+        MESSAGES_URL.format(account_sid=account_sid),
+        auth=(account_sid, auth_token),
+        data={"From": from_number, "To": to_phone, "Body": body},
+        timeout=HTTP_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()['sid']
+
+
+async def _post_message_async(from_number: str, to_phone: str, body: str) -> str:
+    """Async form of _post_message, over the shared httpx client."""
+    account_sid, auth_token, _ = _twilio_config()
+    response = await _get_async_client().post(
+        MESSAGES_URL.format(account_sid=account_sid),
+        auth=(account_sid, auth_token),
+        data={"From": from_number, "To": to_phone, "Body": body}
+    )
+    response.raise_for_status()
+    return response.json()['sid']
+
+
+def _on_send_done(future: Future):
+    """Log a background send that raised instead of returning a result."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error("Background SMS send failed: %s", future.exception())
+
 
 class SMSSender:
     """Helper class for sending SMS messages via Twilio"""
     
+    __slots__ = ("from_number",)
+    
     def __init__(self):
-        """Initialize Twilio client with credentials from environment variables"""
-        account_sid = os.getenv('TWILIO_ACCOUNT_SID')
-        auth_token = os.getenv('TWILIO_AUTH_TOKEN')
-        self.from_number = os.getenv('TWILIO_PHONE_NUMBER')
+        """Read Twilio credentials from environment variables"""
+        account_sid, auth_token, self.from_number = _twilio_config()
         
         if not all([account_sid, auth_token, self.from_number]):
             logger.warning("Twilio credentials not fully configured in environment variables")
         
-        self.client = Client(account_sid, auth_token)
-        logger.info("Twilio SMS client initialized")
+        logger.info("Twilio SMS sender initialized")
+    
+    @property
+    def client(self) -> "Client":
+        """Twilio SDK client, only built (and imported) for Notify bulk sends
+        and when TWILIO_USE_SDK is set."""
+        return _get_client()
     
     def send_appointment_confirmation(self, to_phone: str, first_name: str,
-                                     provider_name: str, appointment_time: str):
+                                     provider_name: str, appointment_time: str) -> SendResult:
         """Send appointment confirmation SMS.
         
         Args:
@@ -31,24 +239,154 @@ class SMSSender:
             appointment_time: Formatted appointment date and time string
         
         Returns:
-            bool: True if SMS sent successfully, False otherwise
+            SendResult: Truthy with the message SID if sent; falsy with the
+            error if Twilio rejected the message
+        
+        Raises:
+            RequestException: On network failures, timeouts, rate limiting
+                and Twilio server errors (as HTTPError), so the caller can retry
+            TwilioRestException: Instead of HTTPError when TWILIO_USE_SDK is set
+        """
+        message_body = _prepare_message(to_phone, first_name, provider_name, appointment_time)
+        if message_body is None:
+            return SendResult(False, error="Invalid phone number")
+        
+        try:
+            if _use_sdk():
+                sid = self._create_via_sdk(to_phone, message_body)
+            else:
+                sid = _post_message(self.from_number, to_phone, message_body)
+        except (TwilioRestException, RequestException) as e:
+            return _send_failed(to_phone, e)
+        logger.info("SMS sent successfully to %s, SID: %s", to_phone, sid)
+        return SendResult(True, sid=sid)
+    
+    def _create_via_sdk(self, to_phone: str, message_body: str) -> str:
+        """Send one message with the Twilio SDK (blocking); returns its SID."""
+        return self.client.messages.create(
+            body=message_body,
+            from_=self.from_number,
+            to=to_phone
+        ).sid
+    
+    def send_appointment_confirmation_background(self, to_phone: str, first_name: str,
+                                                 provider_name: str, appointment_time: str) -> Future:
+        """Queue an appointment confirmation SMS and return immediately.
+        
+        The send runs on a worker thread and its outcome is logged when it
+        completes. Takes the same arguments as send_appointment_confirmation.
+        
+        Returns:
+            Future: Resolves to send_appointment_confirmation's SendResult, or
+            holds the retryable error it raised
         """
-        # Create concise message (SMS has character limits)
-        message_body = (
-            f"Hi {first_name}, your appointment with {provider_name} "
-            f"is confirmed for {appointment_time}. - Voxology Healthcare"
+        future = _EXECUTOR.submit(
+            self.send_appointment_confirmation,
+            to_phone=to_phone,
+            first_name=first_name,
+            provider_name=provider_name,
+            appointment_time=appointment_time
         )
+        future.add_done_callback(_on_send_done)
+        return future
+    
+    def send_bulk_confirmations(self, recipients: list[dict]) -> list[bool]:
+        """Send appointment confirmation SMS to many recipients.
+        
+        When TWILIO_NOTIFY_SERVICE_SID is set, recipients whose messages are
+        identical share one Twilio Notify request; everyone else is sent an
+        individual message.
+        
+        Args:
+            recipients: Dicts of send_appointment_confirmation arguments
+                (to_phone, first_name, provider_name, appointment_time)
+        
+        Returns:
+            list[bool]: Whether each recipient's SMS was sent, in input order
+        """
+        results = [False] * len(recipients)
+        notify_sid = _notify_service_sid()
+        
+        # Group recipients by message text; Notify sends one body to many numbers
+        groups = {}
+        for i, recipient in enumerate(recipients):
+            if notify_sid and _E164.match(recipient["to_phone"]):
+                body = _confirmation_body(
+                    recipient["first_name"],
+                    recipient["provider_name"],
+                    recipient["appointment_time"]
+                )
+                groups.setdefault(body, []).append(i)
+            else:
+                results[i] = self._send_one(recipient)
         
+        for body, indexes in groups.items():
+            if len(indexes) == 1:
+                results[indexes[0]] = self._send_one(recipients[indexes[0]])
+                continue
+            
+            to_binding = [
+                json.dumps({"binding_type": "sms", "address": recipients[i]["to_phone"]})
+                for i in indexes
+            ]
+            try:
+                # Send one notification to every number in the group
+                notification = self.client.notify.v1.services(notify_sid).notifications.create(
+                    body=body,
+                    to_binding=to_binding
+                )
+                logger.info("Bulk SMS sent to %s recipients, SID: %s", len(indexes), notification.sid)
+                sent = True
+            except (TwilioRestException, RequestException) as e:
+                logger.error("Failed to send bulk SMS to %s recipients: %s", len(indexes), e)
+                sent = False
+            for i in indexes:
+                results[i] = sent
+        
+        return results
+    
+    def _send_one(self, recipient: dict) -> bool:
+        """Send one bulk recipient's SMS, counting retryable errors as failures."""
         try:
-            # Send SMS via Twilio
-            message = self.client.messages.create(
-                body=message_body,
-                from_=self.from_number,
-                to=to_phone
-            )
-            logger.info(f"SMS sent successfully to {to_phone}, SID: {message.sid}")
-            return True
-        except Exception as e:
-            logger.error(f"Failed to send SMS to {to_phone}: {e}")
+            return self.send_appointment_confirmation(**recipient).success
+        except (TwilioRestException, RequestException):
+            # Already logged by send_appointment_confirmation
             return False
-
+    
+    async def send_appointment_confirmation_async(self, to_phone: str, first_name: str,
+                                                  provider_name: str, appointment_time: str) -> SendResult:
+        """Send appointment confirmation SMS without blocking the event loop.
+        
+        Posts straight to the Twilio Messages endpoint over a shared keep-alive
+        connection pool, so several sends can run concurrently with
+        asyncio.gather. With TWILIO_USE_SDK set, the SDK send runs in a worker
+        thread instead.
+        
+        Args:
+            to_phone: Recipient's phone number (E.164 format, e.g., +1234567890)
+            first_name: Recipient's first name for personalization
+            provider_name: Healthcare provider's full name
+            appointment_time: Formatted appointment date and time string
+        
+        Returns:
+            SendResult: As for send_appointment_confirmation
+        
+        Raises:
+            httpx.HTTPError: On network failures, timeouts, rate limiting and
+                Twilio server errors, so the caller can retry
+            TwilioRestException: Instead of httpx.HTTPError when TWILIO_USE_SDK
+                is set, along with RequestException for network failures
+        """
+        message_body = _prepare_message(to_phone, first_name, provider_name, appointment_time)
+        if message_body is None:
+            return SendResult(False, error="Invalid phone number")
+        
+        try:
+            if _use_sdk():
+                sid = await asyncio.to_thread(self._create_via_sdk, to_phone, message_body)
+            else:
+                sid = await _post_message_async(self.from_number, to_phone, message_body)
+        except (TwilioRestException, RequestException, httpx.HTTPError) as e:
+            return _send_failed(to_phone, e)
+        logger.info("SMS sent successfully to %s, SID: %s", to_phone, sid)
+        return SendResult(True, sid=sid)
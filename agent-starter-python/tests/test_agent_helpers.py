@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import pytest
+
+from agent import _parse_appointment_datetime, _parse_date, _specialty_from_query
+
+
+@pytest.mark.parametrize(
+    "value",
+    ["01/02/2020", "1/2/2020", "12/31/1999", "02/29/2024", "7/04/1976", "10/1/2001"],
+)
+def test_parse_date_matches_strptime(value):
+    assert _parse_date(value) == datetime.strptime(value, "%m/%d/%Y").date()
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "13/01/2020",
+        "00/10/2020",
+        "02/30/2023",
+        "02/29/2023",
+        "2020-01-02",
+        "01/02/20",
+        "01-02-2020",
+        "",
+        "ab/cd/efgh",
+    ],
+)
+def test_parse_date_rejects_what_strptime_rejects(value):
+    with pytest.raises(ValueError):
+        datetime.strptime(value, "%m/%d/%Y")
+    with pytest.raises(ValueError):
+        _parse_date(value)
+
+
+@pytest.mark.parametrize(
+    ("date_str", "time_str"),
+    [
+        ("01/02/2020", "10:30 AM"),
+        ("01/02/2020", "12:00 AM"),
+        ("01/02/2020", "12:15 PM"),
+        ("12/31/2024", "1:05 pm"),
+        ("3/4/2025", "11:59 PM"),
+        ("3/4/2025", "9:5 am"),
+    ],
+)
+def test_parse_appointment_datetime_matches_strptime(date_str, time_str):
+    expected = datetime.strptime(f"{date_str} {time_str}", "%m/%d/%Y %I:%M %p")
+    assert _parse_appointment_datetime(date_str, time_str) == expected
+
+
+@pytest.mark.parametrize(
+    ("date_str", "time_str"),
+    [
+        ("01/02/2020", "13:00 PM"),
+        ("01/02/2020", "0:30 AM"),
+        ("01/02/2020", "10:60 AM"),
+        ("01/02/2020", "10:30"),
+        ("01/02/2020", "10:30 XM"),
+        ("02/30/2020", "10:30 AM"),
+    ],
+)
+def test_parse_appointment_datetime_rejects_what_strptime_rejects(date_str, time_str):
+    with pytest.raises(ValueError):
+        datetime.strptime(f"{date_str} {time_str}", "%m/%d/%Y %I:%M %p")
+    with pytest.raises(ValueError):
+        _parse_appointment_datetime(date_str, time_str)
+
+
+@pytest.mark.parametrize(
+    ("query", "specialty"),
+    [
+        ("find me a cardiologist in Oklahoma City", "Cardiology"),
+        ("I need an orthopedic surgeon", "Orthopedic Surgery"),
+        ("a general surgeon near me", "General Surgery"),
+        ("a surgeon near me", None),
+        ("an eye surgeon", None),
+        ("a spine surgeon in Dallas", None),
+        ("hand surgeon", None),
+        ("heart surgeon", None),
+        ("family doctor in Milwaukee", "Family Medicine"),
+        ("gynecology practice", "Obstetrics and Gynecology"),
+        ("OB-GYN please", "Obstetrics and Gynecology"),
+        ("a doctor who sees adults and children", None),
+        ("not a heart doctor, a skin doctor", None),
+        ("not a cardiologist, a dermatologist", None),
+        ("a cardiologist or a dermatologist", None),
+        ("I do not want a cardiologist", None),
+        ("I don't want a cardiologist", None),
+        ("I don\u2019t want a cardiologist", None),
+        ("no cardiologist please", None),
+        ("any specialist other than a cardiologist", None),
+        ("everyone except a cardiologist", None),
+        ("a cardiologist who knows oncology", None),
+        ("a cardiologist who takes Aetna", "Cardiology"),
+        ("a neurosurgeon", None),
+        ("someone good", None),
+    ],
+)
+def test_specialty_from_query(query, specialty):
+    assert _specialty_from_query(query) == specialty
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import pytest
+
+import cache_helper
+from cache_helper import LRUCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable monotonic clock for the cache module."""
+    fake = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(
+        cache_helper, "time", SimpleNamespace(monotonic=lambda: fake.now)
+    )
+    return fake
+
+
+def test_get_missing_returns_default():
+    cache = LRUCache(maxsize=2)
+    assert cache.get("missing") is None
+    assert cache.get("missing", "fallback") == "fallback"
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_set_existing_key_refreshes_position():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("a", 10)
+    cache.set("c", 3)
+
+    assert cache.get("a") == 10
+    assert cache.get("b") is None
+
+
+@pytest.mark.parametrize(
+    ("elapsed", "hit"),
+    [(0, True), (59.9, True), (60, False), (3600, False)],
+)
+def test_ttl_expiry(clock, elapsed, hit):
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    clock.now += elapsed
+
+    assert (cache.get("a") == 1) is hit
+
+
+def test_ttl_restarts_on_set(clock):
+    cache = LRUCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    clock.now += 50
+    cache.set("a", 2)
+    clock.now += 50
+
+    assert cache.get("a") == 2
+
+
+def test_no_ttl_never_expires(clock):
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    clock.now += 10**9
+
+    assert cache.get("a") == 1
+
+
+def test_cached_falsy_values_are_hits():
+    cache = LRUCache(maxsize=2)
+    cache.set("empty", [])
+    assert cache.get("empty", "fallback") == []
@@ -0,0 +1,35 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from email_helper import EmailSender
+
+
+@pytest.fixture
+def sender(monkeypatch, tmp_path):
+    monkeypatch.setenv("GMAIL_TOKEN_FILE", str(tmp_path / "token.json"))
+    return EmailSender()
+
+
+def test_save_token_replaces_existing_file(sender, tmp_path):
+    (tmp_path / "token.json").write_text('{"token": "old"}')
+    creds = SimpleNamespace(to_json=lambda: json.dumps({"token": "new"}))
+
+    sender._save_token(creds)
+
+    assert json.loads((tmp_path / "token.json").read_text()) == {"token": "new"}
+    assert [p.name for p in tmp_path.iterdir()] == ["token.json"]
+
+
+def test_save_token_failure_keeps_old_token(sender, tmp_path):
+    (tmp_path / "token.json").write_text('{"token": "old"}')
+
+    def to_json():
+        raise ValueError("serialization failed")
+
+    with pytest.raises(ValueError):
+        sender._save_token(SimpleNamespace(to_json=to_json))
+
+    assert json.loads((tmp_path / "token.json").read_text()) == {"token": "old"}
+    assert [p.name for p in tmp_path.iterdir()] == ["token.json"]
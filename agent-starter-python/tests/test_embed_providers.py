@@ -0,0 +1,183 @@
+import json
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+
+PROVIDERS = [
+    {
+        "id": 1,
+        "full_name": "Dr. Ana O'Neil",
+        "specialty": "Cardiology",
+        "address": {"street": "1 Main St", "city": "San Jose", "state": "CA"},
+        "rating": 4.5,
+        "languages": ["English", "Spanish"],
+        "board_certified": True,
+        "notes": None,
+    },
+    {
+        "id": 2,
+        "full_name": 'Dr. Zoë "Z" Müller',
+        "specialty": "Pediatrics",
+        "address": {"street": "2 Elm [Suite 3]", "city": "Milwaukee", "state": "WI"},
+        "rating": 5,
+        "languages": [],
+        "board_certified": False,
+        "notes": "Line one\nLine two, with {braces} and ]brackets[",
+    },
+    {"id": 3, "years_experience": 12345678901234567890, "rating": -0.25e-3},
+]
+
+DOCUMENTS = [
+    json.dumps(PROVIDERS),
+    json.dumps(PROVIDERS, indent=2),
+    json.dumps(PROVIDERS) + "\n" * 50,
+    " " * 200 + json.dumps(PROVIDERS) + "\n" * 50,
+    "[ " + " ,\n ".join(json.dumps(p) for p in PROVIDERS) + " ] \n",
+    "\n\t [ " + " ,\n ".join(json.dumps(p) for p in PROVIDERS) + " ] \n",
+    json.dumps(PROVIDERS[:1]),
+    "[]",
+    "[ \n ]  ",
+    "  [ \n ]  ",
+]
+
+
+@pytest.mark.parametrize("read_size", [1, 2, 3, 7, 64, 64 * 1024])
+@pytest.mark.parametrize("document", DOCUMENTS)
+def test_iter_providers_matches_json_load(
+    embed_providers, monkeypatch, tmp_path, read_size, document
+):
+    path = tmp_path / "providers.json"
+    path.write_text(document, encoding="utf-8")
+    monkeypatch.setattr(embed_providers, "READ_SIZE", read_size)
+
+    assert list(embed_providers.iter_providers(path)) == json.loads(document)
+
+
+@pytest.mark.parametrize("read_size", [1, 5, 64 * 1024])
+@pytest.mark.parametrize(
+    "document",
+    ["", "   \n", '{"id": 1}', '[{"id": 1}', '[{"id": 1},', '[{"id": 1}, {"id"'],
+)
+def test_iter_providers_rejects_malformed(
+    embed_providers, monkeypatch, tmp_path, read_size, document
+):
+    path = tmp_path / "providers.json"
+    path.write_text(document, encoding="utf-8")
+    monkeypatch.setattr(embed_providers, "READ_SIZE", read_size)
+
+    with pytest.raises(ValueError):
+        list(embed_providers.iter_providers(path))
+
+
+@pytest.fixture
+def clock(embed_providers, monkeypatch):
+    """Fake monotonic clock that asyncio.sleep advances instead of waiting."""
+    fake = SimpleNamespace(now=1000.0, sleeps=[])
+
+    async def sleep(delay):
+        fake.sleeps.append(delay)
+        fake.now += delay
+
+    monkeypatch.setattr(
+        embed_providers, "time", SimpleNamespace(monotonic=lambda: fake.now)
+    )
+    monkeypatch.setattr(embed_providers.asyncio, "sleep", sleep)
+    return fake
+
+
+async def test_rate_limiter_allows_a_burst_up_to_max_rate(embed_providers, clock):
+    limiter = embed_providers.RateLimiter(3, period=60)
+    for _ in range(3):
+        await limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+async def test_rate_limiter_waits_for_the_next_token(embed_providers, clock):
+    limiter = embed_providers.RateLimiter(3, period=60)
+    for _ in range(4):
+        await limiter.acquire()
+
+    assert clock.sleeps == [pytest.approx(20)]
+
+
+async def test_rate_limiter_refills_over_time(embed_providers, clock):
+    limiter = embed_providers.RateLimiter(3, period=60)
+    for _ in range(3):
+        await limiter.acquire()
+    clock.now += 40
+    for _ in range(2):
+        await limiter.acquire()
+
+    assert clock.sleeps == []
+
+
+def _status_error(status, headers=None):
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    response = httpx.Response(status, headers=headers, request=request)
+    return openai.APIStatusError("error", response=response, body=None)
+
+
+@pytest.mark.parametrize(
+    ("status", "retryable"),
+    [
+        (400, False),
+        (401, False),
+        (404, False),
+        (408, True),
+        (409, True),
+        (429, True),
+        (500, True),
+        (502, True),
+        (503, True),
+    ],
+)
+def test_is_retryable_status(embed_providers, status, retryable):
+    assert embed_providers.is_retryable(_status_error(status)) is retryable
+
+
+def test_is_retryable_connection_error(embed_providers):
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    assert embed_providers.is_retryable(openai.APIConnectionError(request=request))
+
+
+@pytest.mark.parametrize(
+    ("retry_after", "expected"),
+    [("2", 2.0), ("0.5", 0.5), ("86400", 60.0), ("-3", 0.0)],
+)
+def test_retry_delay_honors_and_caps_retry_after(
+    embed_providers, retry_after, expected
+):
+    error = _status_error(429, headers={"retry-after": retry_after})
+    assert embed_providers.retry_delay(error, attempt=0) == expected
+
+
+def test_retry_delay_backs_off_without_retry_after(embed_providers):
+    for attempt in range(10):
+        delay = embed_providers.retry_delay(_status_error(503), attempt)
+        base = min(embed_providers.MAX_BACKOFF, 2**attempt)
+        assert base <= delay <= base + 1
+
+
+def test_prepare_metadata_keeps_display_fields(embed_providers):
+    provider = {
+        "id": 7,
+        "full_name": "Dr. Ana O'Neil",
+        "specialty": "Cardiology",
+        "phone": "+14155550001",
+        "email": "ana@example.com",
+        "address": {"street": "1 Main St", "city": "Austin", "state": "TX"},
+        "license_number": "TX-1234",
+        "rating": 4,
+    }
+
+    metadata = embed_providers.prepare_metadata(provider)
+    record = embed_providers.full_record(provider)
+
+    for field in ("full_name", "phone", "email", "license_number"):
+        assert metadata[field] == record[field]
+    assert metadata["address_street"] == record["address"]["street"]
+    # Pinecone metadata values must be flat
+    assert all(isinstance(v, (str, int, float, bool, list)) for v in metadata.values())
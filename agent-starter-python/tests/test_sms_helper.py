@@ -0,0 +1,284 @@
+import json
+from unittest import mock
+
+import httpx
+import pytest
+import requests
+from twilio.base.exceptions import TwilioRestException
+
+import sms_helper
+from sms_helper import SendResult, SMSSender
+
+
+def _recipient(phone, first_name="Ana", provider="Dr. B", time="Monday at 10:00 AM"):
+    return {
+        "to_phone": phone,
+        "first_name": first_name,
+        "provider_name": provider,
+        "appointment_time": time,
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Mocked Twilio SDK client."""
+    client = mock.Mock()
+    monkeypatch.setattr(sms_helper, "_get_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def session(monkeypatch):
+    """Mocked requests session used for direct REST sends."""
+    session = mock.Mock()
+    monkeypatch.setattr(sms_helper, "_SESSION", session)
+    return session
+
+
+@pytest.fixture
+def notify_client(client, monkeypatch):
+    """Notify configured, with the SDK client mocked out."""
+    client.notify.v1.services.return_value.notifications.create.return_value = (
+        mock.Mock(sid="NT1")
+    )
+    monkeypatch.setattr(sms_helper, "_notify_service_sid", lambda: "IS1")
+    return client
+
+
+@pytest.mark.parametrize(
+    ("status", "retryable"),
+    [(400, False), (401, False), (404, False), (429, True), (500, True), (503, True)],
+)
+def test_is_retryable(status, retryable):
+    assert sms_helper._is_retryable(status) is retryable
+
+
+def _response(status, body):
+    response = requests.Response()
+    response.status_code = status
+    response._content = (json.dumps(body) if isinstance(body, dict) else body).encode()
+    return response
+
+
+def _send(phone="+14155551234"):
+    return SMSSender().send_appointment_confirmation(phone, "Ana", "Dr. B", "now")
+
+
+def test_send_posts_to_messages_endpoint(session):
+    session.post.return_value = _response(201, {"sid": "SM1"})
+
+    assert _send() == SendResult(True, sid="SM1")
+    assert session.post.call_args.kwargs["data"]["To"] == "+14155551234"
+
+
+def test_send_uses_sdk_when_enabled(client, session, monkeypatch):
+    monkeypatch.setattr(sms_helper, "_use_sdk", lambda: True)
+    client.messages.create.return_value = mock.Mock(sid="SM1")
+
+    assert _send() == SendResult(True, sid="SM1")
+    session.post.assert_not_called()
+
+
+def test_rest_sends_never_build_the_sdk_client(session, monkeypatch):
+    get_client = mock.Mock()
+    monkeypatch.setattr(sms_helper, "_get_client", get_client)
+    session.post.return_value = _response(201, {"sid": "SM1"})
+
+    assert _send()
+    get_client.assert_not_called()
+
+
+def test_send_returns_result_for_rest_rejections(session):
+    session.post.return_value = _response(400, "bad number")
+
+    result = _send()
+
+    assert result == SendResult(False, error="bad number")
+    assert not result
+
+
+def test_send_returns_result_for_sdk_rejections(client, monkeypatch):
+    monkeypatch.setattr(sms_helper, "_use_sdk", lambda: True)
+    client.messages.create.side_effect = TwilioRestException(
+        400, "https://api.twilio.com/", "bad number"
+    )
+
+    assert _send() == SendResult(False, error="bad number")
+
+
+@pytest.mark.parametrize("status", [429, 500, 503])
+def test_send_reraises_transient_rest_statuses(session, status):
+    session.post.return_value = _response(status, "error")
+
+    with pytest.raises(requests.HTTPError):
+        _send()
+
+
+@pytest.mark.parametrize(
+    "error", [requests.ConnectionError("down"), requests.Timeout("slow")]
+)
+def test_send_reraises_network_errors(session, error):
+    session.post.side_effect = error
+
+    with pytest.raises(type(error)):
+        _send()
+
+
+@pytest.mark.parametrize("status", [429, 503])
+def test_send_reraises_transient_sdk_errors(client, monkeypatch, status):
+    monkeypatch.setattr(sms_helper, "_use_sdk", lambda: True)
+    client.messages.create.side_effect = TwilioRestException(
+        status, "https://api.twilio.com/", "error"
+    )
+
+    with pytest.raises(TwilioRestException):
+        _send()
+
+
+def _requests_http_error(status, text="error"):
+    response = requests.Response()
+    response.status_code = status
+    response._content = text.encode()
+    return requests.HTTPError(response=response)
+
+
+def _httpx_status_error(status, text="error"):
+    request = httpx.Request("POST", "https://api.twilio.com/")
+    response = httpx.Response(status, text=text, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        TwilioRestException(400, "https://api.twilio.com/", "bad number"),
+        _requests_http_error(400, "bad number"),
+        _httpx_status_error(400, "bad number"),
+    ],
+)
+def test_send_failed_returns_result_for_rejections(error):
+    result = sms_helper._send_failed("+14155551234", error)
+
+    assert result == SendResult(False, error="bad number")
+    assert not result
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        TwilioRestException(429, "https://api.twilio.com/", "slow down"),
+        TwilioRestException(503, "https://api.twilio.com/", "unavailable"),
+        _requests_http_error(429),
+        _requests_http_error(500),
+        _httpx_status_error(429),
+        _httpx_status_error(502),
+        requests.ConnectionError("down"),
+        requests.Timeout("slow"),
+        httpx.ConnectError("down"),
+        httpx.ReadTimeout("slow"),
+    ],
+)
+def test_send_failed_reraises_transient_errors(error):
+    with pytest.raises(type(error)):
+        sms_helper._send_failed("+14155551234", error)
+
+
+async def test_async_send_posts_to_messages_endpoint(client, monkeypatch):
+    post = mock.AsyncMock(return_value="SM1")
+    monkeypatch.setattr(sms_helper, "_post_message_async", post)
+
+    result = await SMSSender().send_appointment_confirmation_async(
+        "+14155551234", "Ana", "Dr. B", "now"
+    )
+
+    assert result == SendResult(True, sid="SM1")
+    client.messages.create.assert_not_called()
+
+
+async def test_async_send_uses_sdk_when_enabled(client, monkeypatch):
+    monkeypatch.setattr(sms_helper, "_use_sdk", lambda: True)
+    post = mock.AsyncMock()
+    monkeypatch.setattr(sms_helper, "_post_message_async", post)
+    client.messages.create.return_value = mock.Mock(sid="SM1")
+
+    result = await SMSSender().send_appointment_confirmation_async(
+        "+14155551234", "Ana", "Dr. B", "now"
+    )
+
+    assert result == SendResult(True, sid="SM1")
+    post.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "phone",
+    ["4155551234", "+0155551234", "+1415", "+1415555123456789", "+1 415 555 1234", ""],
+)
+def test_invalid_numbers_are_rejected_without_a_request(client, session, phone):
+    assert _send(phone) == SendResult(False, error="Invalid phone number")
+    session.post.assert_not_called()
+    client.messages.create.assert_not_called()
+
+
+def test_bulk_groups_identical_messages_into_one_notification(notify_client):
+    sender = SMSSender()
+    recipients = [
+        _recipient("+14155550001"),
+        _recipient("+14155550002", first_name="Bo"),
+        _recipient("+14155550003"),
+        _recipient("not-a-number"),
+    ]
+    with mock.patch.object(
+        SMSSender,
+        "send_appointment_confirmation",
+        side_effect=lambda **kw: SendResult(kw["to_phone"].startswith("+")),
+    ) as single:
+        results = sender.send_bulk_confirmations(recipients)
+
+    assert results == [True, True, True, False]
+    create = notify_client.notify.v1.services.return_value.notifications.create
+    create.assert_called_once()
+    bindings = [json.loads(b) for b in create.call_args.kwargs["to_binding"]]
+    assert bindings == [
+        {"binding_type": "sms", "address": "+14155550001"},
+        {"binding_type": "sms", "address": "+14155550003"},
+    ]
+    assert sorted(c.kwargs["to_phone"] for c in single.call_args_list) == [
+        "+14155550002",
+        "not-a-number",
+    ]
+
+
+def test_bulk_marks_whole_group_failed_when_notify_fails(notify_client):
+    create = notify_client.notify.v1.services.return_value.notifications.create
+    create.side_effect = TwilioRestException(400, "https://notify.twilio.com/", "bad")
+
+    results = SMSSender().send_bulk_confirmations(
+        [_recipient("+14155550001"), _recipient("+14155550002")]
+    )
+
+    assert results == [False, False]
+
+
+def test_bulk_without_notify_sends_individually(notify_client, monkeypatch):
+    monkeypatch.setattr(sms_helper, "_notify_service_sid", lambda: None)
+    recipients = [_recipient("+14155550001"), _recipient("+14155550002")]
+    with mock.patch.object(
+        SMSSender, "send_appointment_confirmation", return_value=SendResult(True)
+    ) as single:
+        results = SMSSender().send_bulk_confirmations(recipients)
+
+    assert results == [True, True]
+    assert single.call_count == 2
+    notify_client.notify.v1.services.assert_not_called()
+
+
+def test_bulk_counts_transient_single_send_errors_as_failures(client, monkeypatch):
+    monkeypatch.setattr(sms_helper, "_notify_service_sid", lambda: None)
+    with mock.patch.object(
+        SMSSender,
+        "send_appointment_confirmation",
+        side_effect=requests.ConnectionError("down"),
+    ):
+        results = SMSSender().send_bulk_confirmations([_recipient("+14155550001")])
+
+    assert results == [False]